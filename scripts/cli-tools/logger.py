@@ -1,72 +1,99 @@
 #!/usr/bin/env python3
 
-from loguru import logger
+from datetime import datetime
 import sys
 
+# ---- ANSI sequences, built once ----
+_GREEN          = '\x1b[32m'
+_GREEN_BOLD     = '\x1b[32;1m'
+_YELLOW_BOLD    = '\x1b[33;1m'
+_RED_BOLD       = '\x1b[31;1m'
+_RED_BG_BOLD    = '\x1b[41;1m'
+_BLUE_BOLD      = '\x1b[34;1m'
+_CYAN_BOLD      = '\x1b[36;1m'
+_MAGENTA_BOLD   = '\x1b[35;1m'
+_CYAN           = '\x1b[36m'
+_BOLD           = '\x1b[1m'
+_RESET          = '\x1b[0m'
+
+# ---- Levels we print: name => ( severity, color ) ----
+# ---- Same numbers and colors loguru used, plus our HEADER and STEP levels ----
+_LEVELS = {
+    'TRACE':    ( 5,  _CYAN_BOLD ),
+    'DEBUG':    ( 10, _BLUE_BOLD ),
+    'INFO':     ( 20, _BOLD ),
+    'HEADER':   ( 21, _MAGENTA_BOLD ),
+    'STEP':     ( 22, _CYAN ),
+    'SUCCESS':  ( 25, _GREEN_BOLD ),
+    'WARNING':  ( 30, _YELLOW_BOLD ),
+    'ERROR':    ( 40, _RED_BOLD ),
+    'CRITICAL': ( 50, _RED_BG_BOLD ),
+}
+
+_min_level = _LEVELS['INFO'][0]
+
+
 # ---- Configuration (console only, colored) ----
 # ---- Private fuction which will be called once on import ----
-# ---- Loguru automatically starts with a “default sink” (pretty logs) ----
-# ---- We remove it and replace it with our own customized sink ----
-def _configure( level: str = 'INFO' ):
+def _configure( level: str | int = 'INFO' ):
     """
-        Configure a single console sink with colors.
+        Set the minimum level printed to the console, by name ( e.g. 'DEBUG' ) or severity number.
         Call once on import; you can re-call with a different level if needed.
     """
+    global _min_level
     
-    # ---- Remove default sink ----
-    logger.remove()
-    
-    # ---- Add our console sink ----
-    logger.add(
-        sys.stdout,                 # print to console
-        level = level,              # default level ( INFO unless changed )
-        colorize = True,            # enable colors in terminal
-        format = '<green>{time: YYYY-MM-DD HH:mm:ss}</green> | '
-                 '<level>{level:<7}</level> | '
-                 '<level>{message}</level>', 
-        backtrace = False,          # don't show internal stack traces
-        diagnose = False,           # don't dump variable state
-    )
-    
-    # ---- Loguru already has built in levels: DEBUG, INFO, SUCCESS, WARNING, ERROR, CRITICAL ----
-    # ---- We add two more levels for our case ----
-    try:
-        logger.level('HEADER')
-    except Exception:
-        logger.level( 'HEADER', no = 21, color = '<magenta><bold>' )
-    
-    try:
-        logger.level('STEP')
-    except Exception:
-        logger.level( 'STEP', no = 22, color = '<cyan>' )
-   
-     
+    if isinstance( level, int ):
+        _min_level = level
+    elif level.upper() in _LEVELS:
+        _min_level = _LEVELS[level.upper()][0]
+    else:
+        raise ValueError( f'Unknown log level {level!r}, expected one of: {", ".join( _LEVELS )}' )
+
+    # ---- Flush on every newline so our lines stay in order with subprocess output on the same fd ----
+    if hasattr( sys.stdout, 'reconfigure' ):
+        sys.stdout.reconfigure( line_buffering = True )
+
+
 # --- Configure at import so that as soon as we import logger, the console logging is ready ----
 _configure()
 
 
+def _write( level: str, message: str ):
+    color = _LEVELS[level][1]
+    sys.stdout.write(
+        f'{_GREEN}{datetime.now(): %Y-%m-%d %H:%M:%S}{_RESET} | '
+        f'{color}{level:<7}{_RESET} | '
+        f'{color}{message}{_RESET}\n'
+    )
+
+
+def _log( level: str, message: str ):
+    if _LEVELS[level][0] >= _min_level:
+        _write( level, message )
+
+
 # ---- Lets create helper functions so that logger module can call them to log in terminal ----
 def header( message: str ):
-    logger.log( 'HEADER', message )
+    _log( 'HEADER', message )
 
 def info( message: str ):
-    logger.info( message )
+    _log( 'INFO', message )
 
 def step( message: str ):
-    logger.log( 'STEP', f'************ {message} ************' )
+    _log( 'STEP', f'************ {message} ************' )
 
 def status( message: str ):
-    logger.info( message )
+    _log( 'INFO', message )
 
 def success( message: str ):
-    logger.success( message )
+    _log( 'SUCCESS', message )
 
 def warning( message: str ):
-    logger.warning( message )
+    _log( 'WARNING', message )
 
 def error( message: str ):
-    logger.error( message )
-    
+    _log( 'ERROR', message )
+
 
 # ---- Demo block to show all levels colors ----
 if __name__ == '__main__':
@@ -79,4 +106,4 @@ if __name__ == '__main__':
     warning( "No Dev Hub found, prompting login..." )
     success( "Dev Hub login successful" )
     step( "DEPLOY SOURCE" )
-    error( "Source push failed: Missing permission set" )
\ No newline at end of file
+    error( "Source push failed: Missing permission set" )
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 
+from functools import lru_cache
 from pathlib import Path
 import subprocess
+import shutil
+import json
 import sys
 import argparse
 
-# --- Loguru based module for logging in terminal ---
+# --- Local module for colored logging in terminal ---
 import logger
 
 # --- Paths relative to this file ---
@@ -17,6 +20,19 @@ SCRATCH_DEF         = SFDX_PROJECT_DIR / 'config' / 'project-scratch-def.json'
 SCRATCH_DEF_SHAPE   = SFDX_PROJECT_DIR / 'config' / 'project-scratch-def-shape.json'
 SOURCE_DIR          = SFDX_PROJECT_DIR / 'force-app'
 
+# --- Binaries resolved once, instead of a PATH lookup on every spawn ---
+SF_BIN              = shutil.which( 'sf' )
+GIT_BIN             = shutil.which( 'git' ) or 'git'
+
+# --- sf CLI alias store ( sf v2 still shares ~/.sfdx/alias.json with sfdx ) ---
+SF_ALIAS_FILES      = ( Path.home() / '.sf' / 'alias.json', Path.home() / '.sfdx' / 'alias.json' )
+
+# --- Command string for logs; a plain join, no shell quoting needed just to display it ---
+# --- The binary is shown by name ( `sf ...` ), not the absolute path it runs from ---
+def _fmt_cmd( cmd_list: list[str] ) -> str:
+    return ' '.join( [Path( cmd_list[0] ).name, *cmd_list[1:]] )
+
+
 # --- 
 def run_subprocess( cmd_list: list[str], passthrough: bool = False, cwd: str | None = None ) -> str | None:
     """
@@ -30,7 +46,7 @@ def run_subprocess( cmd_list: list[str], passthrough: bool = False, cwd: str | N
         Returns:
             str | None: _description_
     """
-    cmd_str = ' '.join( cmd_list )
+    cmd_str = _fmt_cmd( cmd_list )
     logger.status( f'$ {cmd_str}' )
     
     try:
@@ -55,8 +71,62 @@ def run_subprocess( cmd_list: list[str], passthrough: bool = False, cwd: str | N
         if hasattr( ex, 'stdout' ) and ex.stdout:
             print( ex.stdout )
         sys.exit(1)
+
+
+def spawn_subprocess( cmd_list: list[str] ) -> subprocess.Popen:
+    """
+        Start a command in the background and capture its output.
+        Used to overlap independent, I/O bound CLI calls with other steps.
         
+        Args:
+            cmd_list => ( list[str] ): Gets all commands in a list that needs to run in terminal
         
+        Returns:
+            subprocess.Popen: Handle to pass to `collect_subprocess`
+    """
+    logger.status( f'$ {_fmt_cmd( cmd_list )} (background)' )
+    
+    return subprocess.Popen(
+        cmd_list,
+        stdout = subprocess.PIPE,
+        stderr = subprocess.STDOUT,
+        stdin = subprocess.DEVNULL,     # keep the terminal for passthrough steps running meanwhile
+        text = True
+    )
+
+
+def collect_subprocess( proc: subprocess.Popen ) -> str:
+    """
+        Wait for a command started with `spawn_subprocess` and return its stdout.
+        Exits the script if the command failed, same as `run_subprocess`.
+    """
+    cmd_str = _fmt_cmd( proc.args )
+    out, _ = proc.communicate()
+    
+    if proc.returncode != 0:
+        logger.error( f'FAILED: {cmd_str}' )
+        
+        if out:
+            print( out )
+        sys.exit(1)
+    
+    logger.success( cmd_str )
+    return out
+        
+        
+def stop_subprocess( proc: subprocess.Popen | None ):
+    """
+        Terminate a command started with `spawn_subprocess` that was never collected
+        ( e.g. an earlier step failed ) and release its pipe.
+    """
+    if proc is None or proc.stdout.closed:
+        return
+    
+    proc.terminate()
+    proc.wait()
+    proc.stdout.close()
+
+
 def norm_env( name: str ) -> str:
     return name.strip().lower().replace(' ', '-')
 
@@ -81,74 +151,99 @@ def git_prepare_branch( environment_name: str, review_mode: bool ):
     logger.step( 'GITHUB' )
     logger.status( 'Checking out `main` branch and getting latest update from Github ...' )
     
-    run_subprocess( ['git', 'checkout', 'main'], passthrough = True )
-    run_subprocess( ['git', 'pull', 'origin', 'main'], passthrough = True )
+    run_subprocess( [GIT_BIN, 'checkout', 'main'], passthrough = True )
+    
+    # --- Only pull when origin/main has moved; ls-remote is one round trip, no fetch ---
+    remote_sha = ( run_subprocess( [GIT_BIN, 'ls-remote', 'origin', 'refs/heads/main'] ) or '' ).split()[:1]
+    local_sha = ( run_subprocess( [GIT_BIN, 'rev-parse', 'main'] ) or '' ).strip()
+    
+    if remote_sha == [local_sha]:
+        logger.status( '`main` is up to date with origin, skipping pull.' )
+    else:
+        run_subprocess( [GIT_BIN, 'pull', 'origin', 'main'], passthrough = True )
     
     if not review_mode:
         logger.status( 'Create and push feature branch from `main`' )
         logger.status( 'Creating new development branch ...' )
         
-        run_subprocess( ['git', 'checkout', '-b', environment_name, 'main' ], passthrough = True )
+        run_subprocess( [GIT_BIN, 'checkout', '-b', environment_name, 'main' ], passthrough = True )
     else:
         logger.status( '--- Review mode ---' )
         logger.status('Checking out development branch ...')
         
-        # --- Check if the branch exists locally ---
-        existing_git_branch = run_subprocess( ['git', 'branch', '--list', environment_name] ) or ''
-        if environment_name in ( existing_git_branch or '' ):
+        # --- Check if the branch exists locally ( exit code only, exact ref match ) ---
+        # --- Not via run_subprocess, a missing branch is an expected non-zero exit here ---
+        show_ref_cmd = [GIT_BIN, 'show-ref', '--verify', '--quiet', f'refs/heads/{environment_name}']
+        logger.status( f'$ {_fmt_cmd( show_ref_cmd )}' )
+        branch_exists = subprocess.run( show_ref_cmd ).returncode == 0
+        
+        if branch_exists:
             logger.status( 'Deleting local branch ...' )
-            run_subprocess( ['git', 'branch', '-D', environment_name], passthrough = True )
+            run_subprocess( [GIT_BIN, 'branch', '-D', environment_name], passthrough = True )
             
-        run_subprocess( ['git', 'checkout', '-b', environment_name, f'origin/{environment_name}'], passthrough = True )
+        run_subprocess( [GIT_BIN, 'checkout', '-b', environment_name, f'origin/{environment_name}'], passthrough = True )
              
 
-def check_sfcli_exists():
+def check_sfcli_exists( version_proc: subprocess.Popen ):
     logger.step( 'CHECK SF CLI' )
     logger.status( 'Validating SFDC Binary is available ...' )
     
-    run_subprocess( ['sf', '--version'] )
+    # --- `sf --version` was started in the background while git was running ---
+    collect_subprocess( version_proc )
 
 
-def login_devhub( devhub_url: str, force_auth: bool ):
+@lru_cache( maxsize = 1 )
+def _read_sf_aliases() -> dict:
+    """
+        Read the sf CLI alias store straight from disk instead of spawning `sf org list`.
+        
+        Returns:
+            dict: alias => username, empty if no alias file could be read
+    """
+    aliases = {}
+    
+    for alias_file in SF_ALIAS_FILES:
+        try:
+            aliases.update( json.loads( alias_file.read_text() ).get( 'orgs', {} ) )
+        except ( OSError, ValueError ):
+            continue
+    return aliases
+
+
+def login_devhub( devhub_url: str, force_auth: bool, org_list_proc: subprocess.Popen ):
     logger.step( 'CHECK SFDX LOGIN STATUS' )
     logger.status( 'Checking SFDX Devhub login status ...' )
     logger.status( 'Retrieving list of Salesforce Orgs ...' )
     logger.step( 'AUTHORIZING DEV HUB' )
-    orgs = run_subprocess( ['sf', 'org', 'list'] ) or ''
+    orgs = collect_subprocess( org_list_proc ) or ''
     
     if force_auth or ('DevHub' not in orgs):
         logger.status( 'Logging into Dev Hub ...' )
         run_subprocess(
             [
-                'sf', 'org', 'login', 'web', 
+                SF_BIN, 'org', 'login', 'web', 
                 '--alias', 'DevHub', 
                 '--set-default-dev-hub', 
                 '--instance-url', devhub_url
             ],
             passthrough = True
         )
+        
+        # --- Verify if now devhub is existing ---
+        if 'DevHub' not in _read_sf_aliases():
+            logger.error( 'Devhub alias not found after login' )
+            sys.exit(1)
     else:
         logger.status( 'Using existing Dev Hub alias `DevHub`.' )
-    
-    # --- Verify if now devhub is existing ---
-    orgs = run_subprocess( ['sf', 'org', 'list'] ) or ''
-    
-    if 'DevHub' not in orgs:
-        logger.error( 'Devhub alias not found after login' )
-        sys.exit(1)
         
         
 def create_scratch_org( environment_name: str, review_mode: bool, preview_mode: bool, def_path: Path ):
     logger.step( 'CREATE SCRATCH ORG' )
     logger.status( 'Attempting to deploy new Scratch Org...' )
     
-    if not def_path.exists():
-        logger.error( f'Scratch definition not found: {def_path}' )
-        sys.exit(1)
-    
     duration_in_days = '7' if review_mode else '30'
     scratch_org_creation_cmd = [
-        'sf', 'org', 'create', 'scratch', 
+        SF_BIN, 'org', 'create', 'scratch', 
         '--definition-file', str( def_path ),
         '--alias', environment_name,
         '--duration-days', duration_in_days,
@@ -165,18 +260,13 @@ def create_scratch_org( environment_name: str, review_mode: bool, preview_mode:
 
 def deploy_source_metadata( environment_name: str ):
     logger.step( 'DEPLOY SOURCE' )
-    
-    if not SFDX_PROJECT_DIR.exists():
-        logger.error( f'Project directory not found: {SFDX_PROJECT_DIR}' )
-        sys.exit(1)
-    
     logger.status( 'Deploying force-app to scratch org ...' )
     
     # --- Try a normal deploy ---
     try:
         run_subprocess(
             [
-                'sf', 'project', 'deploy', 'start',
+                SF_BIN, 'project', 'deploy', 'start',
                 '--target-org', environment_name,
                 '--source-dir', str( SOURCE_DIR )
             ],
@@ -192,7 +282,7 @@ def deploy_source_metadata( environment_name: str ):
 def open_scratch_org( environment_name: str, review_mode: bool ):
     logger.step( 'OPEN ORG' )
     logger.status( 'Opening the scratch org in your browser ...' )
-    run_subprocess( ['sf', 'org', 'open', '--target-org', environment_name], passthrough = True )
+    run_subprocess( [SF_BIN, 'org', 'open', '--target-org', environment_name], passthrough = True )
     
 
 def cleanup( created_branch: str | None, created_scratch_alias: str | None ):
@@ -202,7 +292,7 @@ def cleanup( created_branch: str | None, created_scratch_alias: str | None ):
         try:
             run_subprocess(
                 [
-                    'sf', 'org', 'delete', 'scratch', 
+                    SF_BIN, 'org', 'delete', 'scratch', 
                     '--target-org', created_scratch_alias, 
                     '--no-prompt'
                 ], 
@@ -217,13 +307,13 @@ def cleanup( created_branch: str | None, created_scratch_alias: str | None ):
         try:
             run_subprocess(
                 [
-                    'git', 'checkout', 'main'
+                    GIT_BIN, 'checkout', 'main'
                 ], 
                 passthrough = True
             )
             run_subprocess(
                 [
-                    'git', 'branch', '-D', created_branch
+                    GIT_BIN, 'branch', '-D', created_branch
                 ], 
                 passthrough = True
             )
@@ -231,6 +321,25 @@ def cleanup( created_branch: str | None, created_scratch_alias: str | None ):
             logger.error(f'Failed to delete branch {created_branch}. You may need to clean up manually.')
     
 
+def _check_project_files( scratch_def_path: Path ):
+    """
+        Check the tracked files the scratch org and deploy steps use.
+        Run after `git_prepare_branch`, so it validates the branch those steps will actually see,
+        but still before Dev Hub login and scratch org creation.
+    """
+    required_paths = {
+        'Scratch definition': scratch_def_path,
+        'SFDX project file': SFDX_PROJECT_DIR / 'sfdx-project.json',
+        'Source directory': SOURCE_DIR,
+    }
+    missing = [f'{label} not found: {path}' for label, path in required_paths.items() if not path.exists()]
+    
+    if missing:
+        for message in missing:
+            logger.error( message )
+        sys.exit(1)
+
+
 def main():
     logger.header( 'Scratch Org Script' )
 
@@ -249,20 +358,32 @@ def main():
     
     created_scratch_alias = None
     created_branch = None
+    sf_version_proc = None
+    sf_org_list_proc = None
+
+    scratch_def_path = SCRATCH_DEF_SHAPE if ( args.shape or args.review ) else SCRATCH_DEF
 
     try:
-        # 1. Git setup
+        # 0. Fail fast when the sf CLI isn't installed, before touching git
+        if SF_BIN is None:
+            logger.error( 'Salesforce CLI `sf` not found on PATH. Install it and retry.' )
+            sys.exit(1)
+        
+        # 1. Git setup, with the independent sf CLI probes running in the background meanwhile
+        sf_version_proc = spawn_subprocess( [SF_BIN, '--version'] )
+        sf_org_list_proc = spawn_subprocess( [SF_BIN, 'org', 'list'] )
+        
         git_prepare_branch( env, args.review )
         created_branch = None if args.review else env  # only track if we actually created one
+        _check_project_files( scratch_def_path )
         logger.success( 'Git branch ready.' )
 
         # 2. SF CLI check + Dev Hub login
-        check_sfcli_exists()
-        login_devhub( args.devhub_url, args.force_devhub_connection )
+        check_sfcli_exists( sf_version_proc )
+        login_devhub( args.devhub_url, args.force_devhub_connection, sf_org_list_proc )
         logger.success( 'Dev Hub ready.' )
 
         # 3. Scratch org creation
-        scratch_def_path = SCRATCH_DEF_SHAPE if ( args.shape or args.review ) else SCRATCH_DEF
         create_scratch_org( scratch_alias, args.review, args.preview, scratch_def_path )
         created_scratch_alias = scratch_alias
         logger.success( 'Scratch org created.' )
@@ -284,6 +405,11 @@ def main():
         cleanup( created_branch, created_scratch_alias )
         raise  # re-raise to preserve exit code
     
+    finally:
+        # Don't leave background sf probes running if we bailed out before collecting them
+        stop_subprocess( sf_version_proc )
+        stop_subprocess( sf_org_list_proc )
+    
     
 if __name__ == '__main__':
     main()
\ No newline at end of file